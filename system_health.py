@@ -7,50 +7,156 @@ import psutil
 import time
 from datetime import datetime
 import argparse
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+_INV_GB = 1.0 / (1 << 30)  # Multiply instead of dividing by 1024**3 each tick
 
 class SystemMonitor:
-    def __init__(self, log_file="system_health.log"):
+    # (label, threshold %) in the order check_alerts receives the values
+    ALERT_THRESHOLDS = (("CPU", 85), ("Memory", 85), ("Disk", 90))
+    
+    # Fixed layout of one report, filled in by run_once
+    REPORT_TEMPLATE = (
+        f"\n{'='*50}\n"
+        "SYSTEM HEALTH REPORT\n"
+        "Time: {ts}\n"
+        f"{'='*50}\n"
+        "\nCPU: {cpu}% (Cores: {cores})\n"
+        "Memory: {mem_used}/{mem_total} GB ({mem_percent}%)\n"
+        "Disk C:\\: {disk_used}/{disk_total} GB ({disk_percent}%)\n"
+        "Network UP: {net_sent} MB/s  DOWN: {net_recv} MB/s\n"
+        "Packets Sent: {packets_sent}  Received: {packets_recv}"
+        "{alerts}\n"
+        f"\n{'='*50}"
+    )
+    
+    def __init__(self, log_file="system_health.log", cache_ttl=0.5):
         self.log_file = log_file
+        self.cache_ttl = cache_ttl  # Reuse samples taken within this many seconds
+        self._cache = {}  # name -> (timestamp, value)
+        # Refresh rate per metric, in multiples of the continuous-mode interval.
+        # Disk usage moves slowly, so it is sampled far less often than CPU/memory.
+        self._schedule = {'cpu': 1, 'memory': 1, 'network': 1, 'disk': 10}
+        self._interval = 0  # Set by run_continuous
         self.prev_net_io = psutil.net_io_counters()  # Store previous network stats
+        self._prev_net_t = time.monotonic()  # When prev_net_io was taken
+        # Invariant for the lifetime of the process, so read them once
+        self._cpu_count = psutil.cpu_count(logical=True)
+        self._disk_total_gb = round(psutil.disk_usage('C:\\').total * _INV_GB, 2)
+        psutil.cpu_percent(interval=None)  # Prime so the first real read has a baseline
+        self._cpu_primed_at = time.monotonic()
+        # File writes happen on a listener thread; logging calls only enqueue
+        file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter('%(message)s'))
+        self._log_queue = queue.Queue()
+        self._queue_handler = logging.handlers.QueueHandler(self._log_queue)
+        self._listener = logging.handlers.QueueListener(self._log_queue, file_handler)
+        # Private, unregistered logger per instance: monitors never share files
+        # and nothing is left behind in the global logging registry
+        self._logger = logging.Logger(__name__, logging.INFO)
+        self._logger.propagate = False
+        self._logger.addHandler(self._queue_handler)
+        self._listener.start()
+        self._closed = False
+        atexit.register(self.close)
         self.setup_log()
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Flush pending log records and close the log file"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._logger.removeHandler(self._queue_handler)
+        self._listener.stop()  # Drains the queue before returning
+        for handler in self._listener.handlers:
+            handler.close()
+    
     def setup_log(self):
         """Simple log setup"""
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(f"\n{'='*50}\n")
-            f.write(f"System Check at {datetime.now()}\n")
+        self._logger.info(f"\n{'='*50}")
+        self._logger.info(f"System Check at {datetime.now()}")
     
     def log(self, message):
         """Log to file and print"""
-        print(message)
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(f"{message}\n")
+        sys.stdout.write(f"{message}\n")
+        self._logger.info(message)
+    
+    def _cached(self, name, ttl, fn):
+        """Return the cached value for name if younger than ttl, else refresh it"""
+        now = time.monotonic()
+        hit = self._cache.get(name)
+        if hit is not None and now - hit[0] < ttl:
+            return hit[1]
+        value = fn()
+        self._cache[name] = (now, value)
+        return value
+    
+    def _ttl(self, name):
+        """Cache lifetime for a metric given the current polling interval"""
+        every = self._schedule[name]
+        if every <= 1 or self._interval <= 0:
+            return self.cache_ttl
+        # Half an interval of slack so sleep jitter never skips a due refresh
+        return max(self.cache_ttl, (every - 0.5) * self._interval)
     
     def get_cpu(self):
         """Get CPU metrics"""
-        cpu = psutil.cpu_percent(interval=0.5)
-        cores = psutil.cpu_count()
-        return cpu, cores
+        return self._cached('cpu', self._ttl('cpu'), self._read_cpu)
+    
+    def _read_cpu(self):
+        """Sample CPU metrics from psutil"""
+        # Non-blocking: usage since the previous call instead of a timed sample.
+        # Only a read straight after priming waits, so the window is not empty.
+        wait = 0.1 - (time.monotonic() - self._cpu_primed_at)
+        if wait > 0:
+            time.sleep(wait)
+        cpu = psutil.cpu_percent(interval=None)
+        return cpu, self._cpu_count
     
     def get_memory(self):
         """Get Memory metrics"""
+        return self._cached('memory', self._ttl('memory'), self._read_memory)
+    
+    def _read_memory(self):
+        """Sample Memory metrics from psutil"""
         mem = psutil.virtual_memory()
-        total = round(mem.total / (1024**3), 2)
-        used = round(mem.used / (1024**3), 2)
+        total = round(mem.total * _INV_GB, 2)
+        used = round(mem.used * _INV_GB, 2)
         percent = mem.percent
         return total, used, percent
     
     def get_disk(self):
         """Get Disk metrics"""
+        return self._cached('disk', self._ttl('disk'), self._read_disk)
+    
+    def _read_disk(self):
+        """Sample Disk metrics from psutil"""
         disk = psutil.disk_usage('C:\\')
-        total = round(disk.total / (1024**3), 2)
-        used = round(disk.used / (1024**3), 2)
+        total = self._disk_total_gb
+        used = round(disk.used * _INV_GB, 2)
         percent = disk.percent
         return total, used, percent
     
     def get_network(self):
         """Get Network metrics with per-second calculation"""
+        return self._cached('network', self._ttl('network'), self._read_network)
+    
+    def _read_network(self):
+        """Sample Network metrics from psutil"""
         current = psutil.net_io_counters()
+        now = time.monotonic()
+        elapsed = max(now - self._prev_net_t, 1e-3)
         
         # Calculate bytes sent/received since last check
         bytes_sent = current.bytes_sent - self.prev_net_io.bytes_sent
@@ -62,23 +168,26 @@ class SystemMonitor:
         
         # Store current stats for next calculation
         self.prev_net_io = current
+        self._prev_net_t = now
         
-        # Convert to readable format
-        sent_mb = round(bytes_sent / (1024**2), 3)
-        recv_mb = round(bytes_recv / (1024**2), 3)
+        # Convert to MB per second over the real elapsed time
+        sent_mb = round(bytes_sent / elapsed / (1 << 20), 3)
+        recv_mb = round(bytes_recv / elapsed / (1 << 20), 3)
         
         return sent_mb, recv_mb, packets_sent, packets_recv
     
     def check_alerts(self, cpu, mem, disk):
         """Check for alerts"""
-        alerts = []
-        if cpu > 85: alerts.append(f"CPU High: {cpu}%")
-        if mem > 85: alerts.append(f"Memory High: {mem}%")
-        if disk > 90: alerts.append(f"Disk High: {disk}%")
-        return alerts
+        return [f"{label} High: {value}%"
+                for (label, limit), value in zip(self.ALERT_THRESHOLDS, (cpu, mem, disk))
+                if value > limit]
     
     def run_once(self):
         """Run single check"""
+        # One timestamp per report, taken when sampling starts
+        now = datetime.now()
+        ts = now.isoformat(sep=' ', timespec='seconds')
+        
         # Get metrics
         cpu, cores = self.get_cpu()
         mem_total, mem_used, mem_percent = self.get_memory()
@@ -88,28 +197,25 @@ class SystemMonitor:
         # Check alerts
         alerts = self.check_alerts(cpu, mem_percent, disk_percent)
         
-        # Display results
-        self.log(f"\n{'='*50}")
-        self.log("SYSTEM HEALTH REPORT")
-        self.log(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        self.log(f"{'='*50}")
-        
-        self.log(f"\nCPU: {cpu}% (Cores: {cores})")
-        self.log(f"Memory: {mem_used}/{mem_total} GB ({mem_percent}%)")
-        self.log(f"Disk C:\\: {disk_used}/{disk_total} GB ({disk_percent}%)")
-        self.log(f"Network UP: {net_sent} MB/s  DOWN: {net_recv} MB/s")
-        self.log(f"Packets Sent: {packets_sent}  Received: {packets_recv}")
+        # Fill the fixed report layout in one pass, then emit it with a single write
+        alert_block = "".join(f"\n[!] {alert}" for alert in alerts)
+        if alert_block:
+            alert_block = "\n\n[ALERTS]" + alert_block
         
-        if alerts:
-            self.log(f"\n[ALERTS]")
-            for alert in alerts:
-                self.log(f"[!] {alert}")
-        
-        self.log(f"\n{'='*50}")
+        report = self.REPORT_TEMPLATE.format(
+            ts=ts, cpu=cpu, cores=cores,
+            mem_used=mem_used, mem_total=mem_total, mem_percent=mem_percent,
+            disk_used=disk_used, disk_total=disk_total, disk_percent=disk_percent,
+            net_sent=net_sent, net_recv=net_recv,
+            packets_sent=packets_sent, packets_recv=packets_recv,
+            alerts=alert_block,
+        )
+        self.log(report)
     
     def run_continuous(self, interval=5, duration=None):
         """Run continuous monitoring"""
         self.log(f"Starting continuous monitoring (Interval: {interval}s)")
+        self._interval = interval
         start = time.time()
         
         try:
@@ -120,11 +226,14 @@ class SystemMonitor:
                     self.log("Monitoring completed")
                     break
                 
-                if interval > 0:
-                    time.sleep(interval)
+                # Never spin faster than the collector cache can refresh, or
+                # interval=0 would emit thousands of identical reports a second
+                time.sleep(max(interval, self.cache_ttl))
                     
         except KeyboardInterrupt:
             self.log("Monitoring stopped")
+        finally:
+            self._interval = 0  # Later run_once calls use the plain cache TTL again
 
 def main():
     parser = argparse.ArgumentParser(description="System Health Monitor")
@@ -137,12 +246,11 @@ def main():
     
     args = parser.parse_args()
     
-    monitor = SystemMonitor()
-    
-    if args.once:
-        monitor.run_once()
-    else:
-        monitor.run_continuous(interval=args.interval, duration=args.duration)
+    with SystemMonitor() as monitor:
+        if args.once:
+            monitor.run_once()
+        else:
+            monitor.run_continuous(interval=args.interval, duration=args.duration)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file